@@ -47,9 +47,7 @@ def test_data_manager():
         os.remove(test_db)
     
     try:
-        db = DataManager()
-        db.DB_PATH = test_db
-        db._init_db()
+        db = DataManager(db_path=test_db)
         
         # Test Save/Get
         reviews = [{"platform": "ios", "rating": 5, "reviewText": "Test", "date": datetime.now()}]
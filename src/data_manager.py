@@ -1,8 +1,9 @@
 import sqlite3
 import logging
 import json
+import itertools
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Iterable
 import os
 
 logger = logging.getLogger(__name__)
@@ -13,13 +14,28 @@ class DataManager:
     """
     DB_PATH = "data/pulse.db"
 
-    def __init__(self):
-        os.makedirs("data", exist_ok=True)
+    def __init__(self, db_path: str = None):
+        if db_path is not None:
+            self.DB_PATH = db_path
+        os.makedirs(os.path.dirname(self.DB_PATH) or ".", exist_ok=True)
         self._init_db()
 
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Opens a connection on DB_PATH. WAL (set once in _init_db) makes
+        synchronous=NORMAL safe and skips per-commit fsyncs; these pragmas are
+        per-connection, so they are applied here rather than in _init_db.
+        """
+        conn = sqlite3.connect(self.DB_PATH)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
     def _init_db(self):
         """Initializes the database schema."""
-        with sqlite3.connect(self.DB_PATH) as conn:
+        with self._connect() as conn:
+            # Same journal mode as db_init.ensure_initialized; persists in the file
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS reviews (
                     id TEXT PRIMARY KEY,
@@ -117,12 +133,20 @@ class DataManager:
                 CREATE INDEX IF NOT EXISTS idx_run_history_status
                 ON run_history (status)
             """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_scrape_history_platform_date
+                ON scrape_history (platform, scrape_date)
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_reviews_date_platform
+                ON reviews (date, platform)
+            """)
             conn.commit()
 
     def get_cached_reviews(self, start_date: datetime, end_date: datetime) -> List[Dict[str, Any]]:
         """Retrieves reviews within the specified date range."""
         logger.debug(f"Querying cache for range: {start_date.isoformat()} to {end_date.isoformat()}")
-        with sqlite3.connect(self.DB_PATH) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             query = """
                 SELECT * FROM reviews 
@@ -135,32 +159,56 @@ class DataManager:
             logger.debug(f"Cache result: Found {len(reviews)} reviews.")
             return reviews
 
-    def save_reviews(self, reviews: List[Dict[str, Any]]) -> int:
-        """Saves new reviews to the database, returning the count of saved records."""
+    SAVE_BATCH_SIZE = 500  # rows per executemany; a failing batch is retried row by row
+
+    def save_reviews(self, reviews: Iterable[Dict[str, Any]]) -> int:
+        """
+        Saves new reviews to the database, returning the count of saved records.
+        Accepts any iterable; rows are streamed in SAVE_BATCH_SIZE executemany
+        batches. If SQLite rejects a batch, it is rolled back and replayed one
+        row at a time so only the bad rows are dropped.
+        """
         def json_serial(obj):
             if isinstance(obj, datetime):
                 return obj.isoformat()
             raise TypeError ("Type %s not serializable" % type(obj))
 
-        saved_count = 0
-        with sqlite3.connect(self.DB_PATH) as conn:
+        def rows():
             for r in reviews:
                 try:
-                    conn.execute("""
-                        INSERT OR IGNORE INTO reviews (platform, rating, title, review_text, date, raw_data)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    """, (
+                    yield (
                         r['platform'],
                         r['rating'],
                         r.get('title', ''),
                         r.get('review_text', r.get('reviewText', '')),
                         r['date'] if isinstance(r['date'], str) else r['date'].isoformat(),
                         json.dumps(r, default=json_serial)
-                    ))
-                    if conn.total_changes > 0:
-                        saved_count += 1
+                    )
                 except Exception as e:
                     logger.error(f"Failed to save review: {e}")
+
+        insert_sql = """
+            INSERT OR IGNORE INTO reviews (platform, rating, title, review_text, date, raw_data)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """
+        row_iter = rows()
+        # One transaction and one prepared statement for the whole call
+        saved_count = 0
+        with self._connect() as conn:
+            while batch := list(itertools.islice(row_iter, self.SAVE_BATCH_SIZE)):
+                conn.execute("SAVEPOINT save_reviews_batch")
+                try:
+                    # rowcount rather than total_changes: rolled-back inserts must not count
+                    saved_count += conn.executemany(insert_sql, batch).rowcount
+                except sqlite3.Error as e:
+                    conn.execute("ROLLBACK TO save_reviews_batch")
+                    logger.warning(f"Review batch rejected ({e}); retrying {len(batch)} rows individually")
+                    for row in batch:
+                        try:
+                            saved_count += conn.execute(insert_sql, row).rowcount
+                        except sqlite3.Error as row_error:
+                            logger.error(f"Failed to save review: {row_error}")
+                conn.execute("RELEASE save_reviews_batch")
             conn.commit()
         return saved_count
 
@@ -173,9 +221,9 @@ class DataManager:
         """
         # Improved: Check scrape_history for full coverage
         days_needed = (end_date - start_date).days + 1
-        with sqlite3.connect(self.DB_PATH) as conn:
+        with self._connect() as conn:
             cursor = conn.execute("""
-                SELECT scrape_date FROM scrape_history 
+                SELECT DISTINCT scrape_date FROM scrape_history
                 WHERE platform = ? AND scrape_date >= ? AND scrape_date <= ?
             """, (platform, start_date.date().isoformat(), end_date.date().isoformat()))
             covered_days = {row[0] for row in cursor.fetchall()}
@@ -202,7 +250,7 @@ class DataManager:
 
     def has_platform_history(self, platform: str) -> bool:
         """Checks if there is any scrape history for the given platform."""
-        with sqlite3.connect(self.DB_PATH) as conn:
+        with self._connect() as conn:
             cursor = conn.execute("SELECT 1 FROM scrape_history WHERE platform = ? LIMIT 1", (platform,))
             return cursor.fetchone() is not None
 
@@ -226,14 +274,15 @@ class DataManager:
                 daily_counts[d.date().isoformat()] += 1
 
         days = (end_date - start_date).days + 1
-        with sqlite3.connect(self.DB_PATH) as conn:
-            for i in range(days):
-                day = (start_date + timedelta(days=i)).date().isoformat()
-                count = daily_counts.get(day, 0)
-                conn.execute(
-                    "INSERT INTO scrape_history (id, platform, scrape_date, country, records_count) VALUES (?, ?, ?, ?, ?)", 
-                    (uuid.uuid4().hex, platform, day, country, count)
-                )
+        rows = []
+        for i in range(days):
+            day = (start_date + timedelta(days=i)).date().isoformat()
+            rows.append((uuid.uuid4().hex, platform, day, country, daily_counts.get(day, 0)))
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO scrape_history (id, platform, scrape_date, country, records_count) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
             conn.commit()
 
     def purge_data(self) -> None:
@@ -249,7 +298,7 @@ class DataManager:
         _ACTIVE = ("triggered", "running")
         logger.warning("Initiating full database purge…")
 
-        with sqlite3.connect(self.DB_PATH) as conn:
+        with self._connect() as conn:
             # Guard: refuse to purge while any job is actively in-flight
             active_count = conn.execute(
                 "SELECT COUNT(*) FROM run_history WHERE status IN (?,?)", _ACTIVE
@@ -281,16 +330,28 @@ class DataManager:
 
 
     def upsert_run_log(self, run_data: Dict[str, Any]):
-        """Insert-or-replace a run row. Called immediately at trigger time."""
+        """Insert-or-update a run row in place. Called immediately at trigger time."""
         try:
-            with sqlite3.connect(self.DB_PATH) as conn:
+            with self._connect() as conn:
                 conn.execute("""
-                    INSERT OR REPLACE INTO run_history
+                    INSERT INTO run_history
                         (run_id, status, trigger_source, triggered_by,
                          start_date, end_date, triggered_at,
                          started_at, completed_at,
                          reviews_processed, themes_identified, error_message)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(run_id) DO UPDATE SET
+                        status = excluded.status,
+                        trigger_source = excluded.trigger_source,
+                        triggered_by = excluded.triggered_by,
+                        start_date = excluded.start_date,
+                        end_date = excluded.end_date,
+                        triggered_at = excluded.triggered_at,
+                        started_at = excluded.started_at,
+                        completed_at = excluded.completed_at,
+                        reviews_processed = excluded.reviews_processed,
+                        themes_identified = excluded.themes_identified,
+                        error_message = excluded.error_message
                 """, (
                     run_data['run_id'],
                     run_data.get('status', 'triggered'),
@@ -326,7 +387,7 @@ class DataManager:
         values = list(fields.values()) + [run_id]
 
         try:
-            with sqlite3.connect(self.DB_PATH) as conn:
+            with self._connect() as conn:
                 conn.execute(
                     f"UPDATE run_history SET {set_clause} WHERE run_id = ?", values
                 )
@@ -338,7 +399,7 @@ class DataManager:
     def list_run_history(self, limit: int = 20) -> List[Dict[str, Any]]:
         """Returns all runs (any status), newest-first. Used by the dashboard."""
         try:
-            with sqlite3.connect(self.DB_PATH) as conn:
+            with self._connect() as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.execute("""
                     SELECT * FROM run_history
@@ -350,10 +411,29 @@ class DataManager:
             logger.error(f"Failed to list run history: {e}")
             return []
 
+    def list_run_history_for_ui(self, limit: int = 30) -> List[Dict[str, Any]]:
+        """
+        Newest-first runs with only the columns the dashboard table renders.
+        Polled while runs are in flight, so it skips stats and error text.
+        """
+        try:
+            with self._connect() as conn:
+                conn.row_factory = sqlite3.Row
+                cursor = conn.execute("""
+                    SELECT run_id, status, start_date, end_date, triggered_at
+                    FROM run_history
+                    ORDER BY triggered_at DESC
+                    LIMIT ?
+                """, (limit,))
+                return [dict(r) for r in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Failed to list run history: {e}")
+            return []
+
     def get_run_log(self, run_id: str) -> Dict[str, Any]:
         """Retrieves metadata for a specific run."""
         try:
-            with sqlite3.connect(self.DB_PATH) as conn:
+            with self._connect() as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.execute("SELECT * FROM run_history WHERE run_id = ?", (run_id,))
                 row = cursor.fetchone()
@@ -367,7 +447,7 @@ class DataManager:
     def get_all_applications(self) -> List[Dict[str, str]]:
         """Returns every tracked application as a list of dicts."""
         try:
-            with sqlite3.connect(self.DB_PATH) as conn:
+            with self._connect() as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.execute("SELECT * FROM applications ORDER BY app_name")
                 return [dict(r) for r in cursor.fetchall()]
@@ -378,7 +458,7 @@ class DataManager:
     def get_application(self, app_name: str) -> Dict[str, str]:
         """Returns a single application row by name, or empty dict."""
         try:
-            with sqlite3.connect(self.DB_PATH) as conn:
+            with self._connect() as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.execute(
                     "SELECT * FROM applications WHERE app_name = ?", (app_name,)
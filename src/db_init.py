@@ -136,6 +136,14 @@ def _create_schema(db_path: str) -> None:
             CREATE INDEX IF NOT EXISTS idx_run_history_status
             ON run_history (status)
         """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_scrape_history_platform_date
+            ON scrape_history (platform, scrape_date)
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_reviews_date_platform
+            ON reviews (date, platform)
+        """)
 
         conn.commit()
 
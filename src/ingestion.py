@@ -1,9 +1,10 @@
 import csv
 import json
 import logging
+import itertools
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field, validator
+from typing import List, Dict, Any, Optional, Iterator
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError, validator
 from src.pii_cleaner import PIICleaner
 
 # Configure Logging
@@ -51,20 +52,40 @@ class ReviewSchema(BaseModel):
                 continue
         raise ValueError(f"Could not parse date: {v}")
 
+_REVIEW_LIST_ADAPTER = TypeAdapter(List[ReviewSchema])
+
+def parse_many(rows: List[Dict[str, Any]]) -> List[ReviewSchema]:
+    """
+    Validates a batch of raw review dicts in one pass. Rows that fail
+    validation are logged and dropped, the rest are returned in order.
+    """
+    try:
+        return _REVIEW_LIST_ADAPTER.validate_python(rows)
+    except ValidationError as e:
+        bad = {err['loc'][0] for err in e.errors()}
+        logger.debug(f"Skipping {len(bad)} invalid review(s) in batch: {e}")
+        return _REVIEW_LIST_ADAPTER.validate_python([r for i, r in enumerate(rows) if i not in bad])
+
 class IngestionModule:
     """
     Handles CSV ingestion, filtering, and normalization of app reviews.
     Pure Python implementation to avoid system dependency issues.
     """
     
+    BATCH_SIZE = 500  # CSV rows validated per parse_many call
+
     def __init__(self, weeks_back: int = 12):
         self.weeks_back = weeks_back
         self.cutoff_date = datetime.now() - timedelta(weeks=weeks_back)
 
-    def process_csv(self, file_path: str) -> List[Dict[str, Any]]:
+    def process_csv(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """
+        Yields cleaned, in-range, de-duplicated reviews one row at a time so a
+        large CSV is never held in memory twice. Wrap in list() to materialise.
+        """
         logger.info(f"Starting ingestion for file: {file_path}")
         
-        processed_reviews = []
+        processed_count = 0
         seen_reviews = set() # For deduplication (text + date)
 
         try:
@@ -76,23 +97,28 @@ class IngestionModule:
                 if not required_cols.issubset(set(reader.fieldnames or [])):
                     missing = required_cols - set(reader.fieldnames or [])
                     logger.error(f"Missing columns in CSV: {missing}")
-                    return []
-
-                for row in reader:
-                    try:
-                        # 1. basic cleaning & validation
-                        if not row['review_text'] or not row['rating'] or not row['date']:
-                            continue
-                        
-                        # 2. Validation & Normalization via Pydantic
-                        review_obj = ReviewSchema(
-                            rating=row['rating'],
-                            title=row['title'],
-                            review_text=row['review_text'],
-                            date=row['date'],
-                            platform=row.get('platform', 'unknown')
-                        )
-
+                    return
+
+                while True:
+                    chunk = list(itertools.islice(reader, self.BATCH_SIZE))
+                    if not chunk:
+                        break
+
+                    # 1. basic cleaning & validation
+                    raw_rows = [
+                        {
+                            'rating': row['rating'],
+                            'title': row['title'],
+                            'review_text': row['review_text'],
+                            'date': row['date'],
+                            'platform': row.get('platform', 'unknown'),
+                        }
+                        for row in chunk
+                        if row['review_text'] and row['rating'] and row['date']
+                    ]
+
+                    # 2. Validation & Normalization via Pydantic, one call per chunk
+                    for review_obj in parse_many(raw_rows):
                         # 3. Filter by date range
                         if review_obj.date < self.cutoff_date:
                             continue
@@ -108,19 +134,14 @@ class IngestionModule:
                             continue
                             
                         # Convert to dict for output
-                        review_dict = review_obj.dict()
-                        processed_reviews.append(review_dict)
-                        
-                    except Exception as e:
-                        logger.debug(f"Skipping row due to error: {e}")
-                        continue
+                        processed_count += 1
+                        yield review_obj.dict()
 
         except Exception as e:
             logger.error(f"Failed to process CSV: {e}")
-            return []
+            return
 
-        logger.info(f"Successfully processed {len(processed_reviews)} reviews.")
-        return processed_reviews
+        logger.info(f"Successfully processed {processed_count} reviews.")
 
     def save_to_json(self, reviews: List[Dict[str, Any]], output_path: str):
         try:
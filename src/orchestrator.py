@@ -1,8 +1,10 @@
 ﻿import os
 import json
 import logging
+import functools
+import uuid
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
 from src.scraper_engine import ScraperEngine
 from src.theme_engine import ThemeClusteringEngine
 from src.report_generator import PulseReportGenerator
@@ -12,6 +14,12 @@ from utils.logger import setup_logger
 
 logger = setup_logger("orchestrator")
 
+@functools.lru_cache(maxsize=4)
+def _load_completed_weeks(path: str, mtime_ns: int, size: int) -> frozenset:
+    """Completed week ids from the manifest; a rewrite changes mtime/size and misses the cache."""
+    with open(path, 'r') as f:
+        return frozenset(json.load(f).get("completed_weeks", []))
+
 class PulsePipelineError(Exception):
     """Custom exception for pipeline failures."""
     def __init__(self, message: str, stage: str):
@@ -33,19 +41,29 @@ class PulseOrchestrator:
         os.makedirs('data/raw', exist_ok=True)
         os.makedirs('data/processed', exist_ok=True)
 
+    @staticmethod
+    def make_custom_run_id(start_date, end_date) -> str:
+        """
+        custom_START_END_HHMMSS_xxxxxx. The random suffix keeps runs started in
+        the same second (the pipeline pool runs them concurrently) from sharing
+        a run_log row.
+        """
+        return (f"custom_{start_date:%Y%m%d}_{end_date:%Y%m%d}_"
+                f"{datetime.now():%H%M%S}_{uuid.uuid4().hex[:6]}")
+
     def _get_week_id(self) -> str:
         """Returns a YYYY-WW identifier for the current week."""
         return datetime.now().strftime("%Y-W%W")
 
     def _already_run_this_week(self) -> bool:
         """Checks the manifest if a run has already completed for this week."""
-        if not os.path.exists(self.MANIFEST_FILE):
+        try:
+            st = os.stat(self.MANIFEST_FILE)
+        except FileNotFoundError:
             return False
             
         try:
-            with open(self.MANIFEST_FILE, 'r') as f:
-                manifest = json.load(f)
-                return self._get_week_id() in manifest.get("completed_weeks", [])
+            return self._get_week_id() in _load_completed_weeks(self.MANIFEST_FILE, st.st_mtime_ns, st.st_size)
         except Exception as e:
             logger.error(f"Failed to read manifest: {e}")
             return False
@@ -67,7 +85,16 @@ class PulseOrchestrator:
             with open(self.MANIFEST_FILE, 'w') as f:
                 json.dump(manifest, f, indent=2)
 
-    def run_pipeline(self, force: bool = False, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None, run_id: Optional[str] = None, app_name: Optional[str] = None) -> Dict[str, Any]:
+    def _report_progress(self, progress_cb: Optional[Callable[[str], None]], message: str):
+        """Logs a stage message and forwards it to the caller's progress callback, if any."""
+        logger.info(message)
+        if progress_cb:
+            try:
+                progress_cb(message)
+            except Exception as e:
+                logger.warning(f"Progress callback failed: {e}")
+
+    def run_pipeline(self, force: bool = False, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None, run_id: Optional[str] = None, app_name: Optional[str] = None, progress_cb: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
         """
         Executes the full pipeline.
         :param force: If True, bypasses idempotency check.
@@ -75,6 +102,7 @@ class PulseOrchestrator:
         :param end_date: Optional end date for scraping.
         :param run_id: Optional pre-generated run_id for tracking.
         :param app_name: Optional application name to look up store IDs from the DB.
+        :param progress_cb: Optional callable receiving a message as each stage starts.
         """
         # 0. Handle Date Defaults
         current_end = end_date or datetime.now()
@@ -86,11 +114,7 @@ class PulseOrchestrator:
         
         if not run_id:
             if is_custom_run:
-                # Format: custom_START_END_TIMESTAMP
-                timestamp = datetime.now().strftime('%H%M%S')
-                start_str = current_start.strftime('%Y%m%d')
-                end_str = current_end.strftime('%Y%m%d')
-                run_id = f"custom_{start_str}_{end_str}_{timestamp}"
+                run_id = self.make_custom_run_id(current_start, current_end)
             else:
                 run_id = self._get_week_id()
 
@@ -116,7 +140,7 @@ class PulseOrchestrator:
             )
 
             # 1. Incremental Scrape & Clean
-            logger.info(f"Stage 1/4: Intelligent Scraping ({current_start.date()} to {current_end.date()})...")
+            self._report_progress(progress_cb, f"Stage 1/4: Intelligent Scraping ({current_start.date()} to {current_end.date()})...")
             
             # Build platform list from the applications table
             # Use a fresh DataManager to avoid stale @st.cache_resource issues
@@ -204,7 +228,7 @@ class PulseOrchestrator:
                 json.dump(all_reviews, f, indent=2, default=str)
 
             # 3. Cluster
-            logger.info("Stage 2/4: Clustering Themes...")
+            self._report_progress(progress_cb, "Stage 2/4: Clustering Themes...")
             engine = ThemeClusteringEngine()
             themes_objs = engine.cluster_reviews(all_reviews)
             themes = [t.model_dump() if hasattr(t, 'model_dump') else t.dict() for t in themes_objs]
@@ -214,7 +238,7 @@ class PulseOrchestrator:
                 json.dump(themes, f, indent=2)
 
             # 4. Generate Reports
-            logger.info("Stage 3/4: Generating Reports...")
+            self._report_progress(progress_cb, "Stage 3/4: Generating Reports...")
             report_gen = PulseReportGenerator()
             pulse_note = report_gen.generate_note(themes)
             
@@ -240,6 +264,7 @@ class PulseOrchestrator:
                 f.write(email_html)
 
             # Persist run log — transition to succeeded
+            self._report_progress(progress_cb, "Stage 4/4: Saving Run Log...")
             self.data_manager.update_run_status(
                 run_id, "succeeded",
                 completed_at=datetime.now().isoformat(),
@@ -3,17 +3,19 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+
 class PIICleaner:
     """
     Utility class to strip PII (Personally Identifiable Information) from text.
     """
     
-    # Regex patterns for common PII
-    EMAIL_PATTERN = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-    PHONE_PATTERN = r'\+?\d{1,4}?[-.\s]?\(?\d{1,3}?\)?[-.\s]?\d{1,4}[-.\s]?\d{1,4}[-.\s]?\d{1,9}'
-    URL_PATTERN = r'https?://(?:[-\w.]|(?:%[\da-fA-F]{2}))+'
+    # Regex patterns for common PII, compiled once at class creation
+    EMAIL_PATTERN = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+    PHONE_PATTERN = re.compile(r'\+?\d{1,4}?[-.\s]?\(?\d{1,3}?\)?[-.\s]?\d{1,4}[-.\s]?\d{1,4}[-.\s]?\d{1,9}')
+    URL_PATTERN = re.compile(r'https?://(?:[-\w.]|(?:%[\da-fA-F]{2}))+')
     # Basic patterns for common Indian ID formats if applicable (like PAN, but kept generic)
-    ID_PATTERN = r'\b[A-Z]{5}[0-9]{4}[A-Z]{1}\b|\b\d{12}\b' 
+    ID_PATTERN = re.compile(r'\b[A-Z]{5}[0-9]{4}[A-Z]{1}\b|\b\d{12}\b')
 
     @classmethod
     def clean(cls, text: str) -> str:
@@ -23,10 +25,10 @@ class PIICleaner:
         original_text = text
         
         # Replace patterns with placeholders
-        text = re.sub(cls.EMAIL_PATTERN, "[EMAIL]", text)
-        text = re.sub(cls.PHONE_PATTERN, "[PHONE]", text)
-        text = re.sub(cls.URL_PATTERN, "[URL]", text)
-        text = re.sub(cls.ID_PATTERN, "[ID]", text)
+        text = cls.EMAIL_PATTERN.sub("[EMAIL]", text)
+        text = cls.PHONE_PATTERN.sub("[PHONE]", text)
+        text = cls.URL_PATTERN.sub("[URL]", text)
+        text = cls.ID_PATTERN.sub("[ID]", text)
         
         if original_text != text:
              logger.debug("PII detected and masked in text.")
@@ -42,7 +44,7 @@ class PIICleaner:
             return ""
         
         # Remove HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
+        text = _HTML_TAG_RE.sub('', text)
         
         # Remove emojis (keeping only basic multilingual plane for simplicity, 
         # or just stripping anything that isn't standard alphanumeric/punctuation)
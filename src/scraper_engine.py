@@ -1,10 +1,9 @@
 import urllib.request
 import json
 import logging
-import re
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
-from src.ingestion import ReviewSchema
+from src.ingestion import parse_many
 
 # Use the library for Android as it is more robust, if it works
 try:
@@ -50,6 +49,7 @@ class ScraperEngine:
                     break
                     
                 earliest_date = None
+                page_rows = []
                 for entry in entries:
                     # Skip app info entries (they don't have im:rating)
                     if 'im:rating' not in entry:
@@ -67,17 +67,18 @@ class ScraperEngine:
                         if not (self.start_date <= review_date <= self.end_date):
                             continue
                             
-                        review_obj = ReviewSchema(
-                            rating=int(entry['im:rating']['label']),
-                            title=entry['title']['label'],
-                            review_text=entry['content']['label'],
-                            date=review_date,
-                            platform="ios"
-                        )
-                        processed.append(review_obj.dict())
+                        page_rows.append({
+                            'rating': int(entry['im:rating']['label']),
+                            'title': entry['title']['label'],
+                            'review_text': entry['content']['label'],
+                            'date': review_date,
+                            'platform': "ios"
+                        })
                     except Exception as e:
                         logger.debug(f"Skipping App Store entry: {e}")
                         continue
+
+                processed.extend(review_obj.dict() for review_obj in parse_many(page_rows))
                 
                 if earliest_date and earliest_date < self.start_date:
                     break
@@ -113,6 +114,7 @@ class ScraperEngine:
                     break
                     
                 earliest_date = None
+                page_rows = []
                 for r in result:
                     review_date = r['at']
                     
@@ -122,14 +124,15 @@ class ScraperEngine:
                     if not (self.start_date <= review_date <= self.end_date):
                         continue
                         
-                    review_obj = ReviewSchema(
-                        rating=r['score'],
-                        title="",
-                        review_text=r['content'],
-                        date=review_date,
-                        platform="android"
-                    )
-                    processed.append(review_obj.dict())
+                    page_rows.append({
+                        'rating': r['score'],
+                        'title': "",
+                        'review_text': r['content'],
+                        'date': review_date,
+                        'platform': "android"
+                    })
+
+                processed.extend(review_obj.dict() for review_obj in parse_many(page_rows))
                     
                 # If the earliest review in the batch is older than our start_date, we have gone far enough back
                 if earliest_date and earliest_date < self.start_date:
@@ -1,9 +1,15 @@
 import json
 import logging
+import random
+import re
+import time
 from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field, validator, ValidationError
-from openai import OpenAI
+from pydantic import BaseModel, Field, validator
+from openai import OpenAI, RateLimitError, APITimeoutError, APIStatusError
 import os
+import functools
+import tiktoken
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -43,6 +49,11 @@ class ThemeOutput(BaseModel):
             return v[:5]
         return v
 
+# Pydantic v2 compiles the core schemas when the classes are defined; run one
+# validation here so the first cluster_reviews call doesn't pay the warm-up cost.
+ThemeOutput(themes=[{"label": "warmup", "review_count": 0, "summary": "", "sentiment": "Neutral",
+                     "business_impact": "", "high_signal_quotes": [], "action_ideas": []}])
+
 class ThemeClusteringEngine:
     """
     Groups reviews into semantic themes using LLM.
@@ -50,7 +61,6 @@ class ThemeClusteringEngine:
     
     CLUSTERING_PROMPT = """
     You are a Senior Product Manager. Your task is to analyze a list of user reviews for the given mobile app and group them into at most 5 semantic themes.
-    For each theme, you must also select 3 high-signal quotes and propose 3 specific action ideas.
 
     ### Rules:
     1. Semantic Grouping: Group similar feedback (e.g., UI issues, payment failures).
@@ -61,20 +71,6 @@ class ThemeClusteringEngine:
     6. Coverage: Every major feedback point should fall into one of these 5 categories.
     7. Prioritization: Focus on the most frequent and impactful themes.
 
-    ### Quote Selection Criteria:
-    Select EXACTLY 3 quotes per theme that are clear, representative, non-PII, and ≤ 25 words.
-
-    ### Action Ideas Criteria:
-    Propose EXACTLY 3 action ideas per theme that are:
-    - SPECIFIC: Avoid generic terms like "Improve User Experience". Use "Add a status tracker for withdrawals".
-    - REALISTIC: Focus on incremental, high-impact changes. Avoid massive architectural overhauls (e.g., Do NOT suggest "Rewrite the entire backend").
-    - IMPLEMENTABLE: Clear enough for a Jira ticket. Can be completed in a 2-week sprint.
-    - CONCISE: Max 15 words per idea.
-
-    ### Deduplication & Bias Mitigation:
-    - Deduplication: Ensure quotes and action ideas represent distinct perspectives.
-    - Bias Mitigation: Avoid 'extreme-only' bias in quote selection.
-    
     ### Input Reviews:
     {reviews_text}
     
@@ -87,51 +83,162 @@ class ThemeClusteringEngine:
           "review_count": 12,
           "summary": "Brief explanation.",
           "sentiment": "Negative",
-          "business_impact": "High churn risk due to payment failures.",
-          "high_signal_quotes": ["Quote 1", "Quote 2", "Quote 3"],
-          "action_ideas": ["Action 1", "Action 2", "Action 3"]
+          "business_impact": "High churn risk due to payment failures."
         }}
       ]
     }}
     
-    IMPORTANT: Maximum 5 themes. Enforce exactly 3 quotes and 3 action ideas per theme.
+    IMPORTANT: Maximum 5 themes.
+    """
+
+    ENRICHMENT_PROMPT = """
+    You are a Senior Product Manager. The reviews below were grouped under the theme "{label}": {summary}
+    Select 3 high-signal quotes from these reviews and propose 3 specific action ideas for this theme.
+
+    ### Quote Selection Criteria:
+    Select EXACTLY 3 quotes that are clear, representative, non-PII, and ≤ 25 words.
+
+    ### Action Ideas Criteria:
+    Propose EXACTLY 3 action ideas that are:
+    - SPECIFIC: Avoid generic terms like "Improve User Experience". Use "Add a status tracker for withdrawals".
+    - REALISTIC: Focus on incremental, high-impact changes. Avoid massive architectural overhauls (e.g., Do NOT suggest "Rewrite the entire backend").
+    - IMPLEMENTABLE: Clear enough for a Jira ticket. Can be completed in a 2-week sprint.
+    - CONCISE: Max 15 words per idea.
+
+    ### Deduplication & Bias Mitigation:
+    - Deduplication: Ensure quotes and action ideas represent distinct perspectives.
+    - Bias Mitigation: Avoid 'extreme-only' bias in quote selection.
+
+    ### Theme Reviews:
+    {reviews_text}
+
+    ### Output Format:
+    Return a JSON object with the following structure:
+    {{
+      "high_signal_quotes": ["Quote 1", "Quote 2", "Quote 3"],
+      "action_ideas": ["Action 1", "Action 2", "Action 3"]
+    }}
     """
 
+    # Retry policy for transient OpenAI failures (rate limits, timeouts, 5xx)
+    MAX_ATTEMPTS = 3
+    REQUEST_TIMEOUT = 20  # seconds per attempt
+    RETRY_DEADLINE = 30   # seconds across all attempts
+
+    # Token budget for packing reviews into the prompt: ~90% of the model's context window.
+    # Dated snapshots (e.g. gpt-4o-mini-2024-07-18) match by prefix; unknown models get the default.
+    MODEL_CONTEXT_TOKENS = {
+        "gpt-4o": 128000,
+        "gpt-4o-mini": 128000,
+        "gpt-4-turbo": 128000,
+        "gpt-4.1": 1047576,
+        "gpt-4": 8192,
+        "gpt-3.5-turbo": 16385,
+    }
+    DEFAULT_CONTEXT_TOKENS = 128000
+    INPUT_BUDGET_RATIO = 0.9
+    OUTPUT_TOKEN_RESERVE = 1000
+    SYSTEM_MESSAGE = "You are a deterministic NLP assistant."
+
+    # Stage 2 sends each theme only its most relevant reviews, one call per theme in parallel
+    MAX_THEMES = 5
+    ENRICHMENT_SAMPLE_SIZE = 40
+
     def __init__(self, model: str = "gpt-4o-mini", api_key: Optional[str] = None):
-        self.client = OpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"))
+        # max_retries=0: _create_completion is the only retry layer, so RETRY_DEADLINE holds
+        self.client = OpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"), max_retries=0)
         self.model = model
+        self._enc = self._load_encoding(model)
+        self.max_input_tokens = int(self._context_tokens(model) * self.INPUT_BUDGET_RATIO)
+
+    @classmethod
+    def _context_tokens(cls, model: str) -> int:
+        """Context window for the model, by longest matching name prefix."""
+        matches = [name for name in cls.MODEL_CONTEXT_TOKENS if model.startswith(name)]
+        if not matches:
+            return cls.DEFAULT_CONTEXT_TOKENS
+        return cls.MODEL_CONTEXT_TOKENS[max(matches, key=len)]
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _load_encoding(model: str):
+        """
+        Returns the tokenizer for the model, or None if it cannot be loaded.
+        Memoized per process so an offline host only waits on the download once.
+        """
+        try:
+            try:
+                return tiktoken.encoding_for_model(model)
+            except KeyError:
+                return tiktoken.get_encoding("o200k_base")
+        except Exception as e:
+            # The BPE files are downloaded on first use; fall back to an estimate when offline.
+            logger.warning(f"Tokenizer unavailable for {model}, estimating token counts: {e}")
+            return None
+
+    def _count_tokens(self, text: str) -> int:
+        if self._enc is None:
+            return len(text) // 4 + 1
+        return len(self._enc.encode_ordinary(text))
+
+    def _pack_reviews(self, reviews: List[Dict[str, Any]]) -> List[str]:
+        """
+        Greedily formats reviews until the prompt would exceed the model's
+        input budget (minus headroom for the system message, prompt template
+        and the response).
+        """
+        budget = (self.max_input_tokens - self.OUTPUT_TOKEN_RESERVE
+                  - self._count_tokens(self.SYSTEM_MESSAGE)
+                  - self._count_tokens(self.CLUSTERING_PROMPT))
+        lines = []
+        used = 0
+        for r in reviews:
+            line = f"- [{r['rating']}*] {r['title']}: {r['review_text']}"
+            cost = self._count_tokens(line) + 1  # trailing newline
+            if used + cost > budget:
+                break
+            lines.append(line)
+            used += cost
+        if len(lines) < len(reviews):
+            logger.info(f"Token budget reached: packed {len(lines)}/{len(reviews)} reviews (~{used} tokens).")
+        return lines
 
     def cluster_reviews(self, reviews: List[Dict[str, Any]]) -> List[Theme]:
+        """
+        Two-stage clustering: one call groups the reviews into themes (labels,
+        counts, summaries only), then quotes and action ideas are generated per
+        theme in parallel from that theme's most relevant reviews.
+        """
         if not reviews:
             logger.warning("No reviews to cluster.")
             return []
 
-        # Prepare text for LLM (limit to avoid token overflow)
+        # Prepare text for LLM: pack as many reviews as fit the model's input budget
         # In a real production system, we might use embeddings + local clustering first,
         # but for this pulse report requirements, we send a rich sample.
-        reviews_sample = reviews[:100] # Take first 100 for clustering
-        formatted_reviews = "\n".join([
-            f"- [{r['rating']}*] {r['title']}: {r['review_text']}"
-            for r in reviews_sample
-        ])
+        formatted_reviews = "\n".join(self._pack_reviews(reviews))
 
         prompt = self.CLUSTERING_PROMPT.format(reviews_text=formatted_reviews)
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a deterministic NLP assistant."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.2, # Low temperature for deterministic output
-                response_format={"type": "json_object"}
-            )
+            response = self._create_completion([
+                {"role": "system", "content": self.SYSTEM_MESSAGE},
+                {"role": "user", "content": prompt}
+            ])
 
             result_json = json.loads(response.choices[0].message.content)
             
+            # Keep the top themes by volume before spending enrichment calls on them
+            themes = sorted(result_json.get("themes", []), key=lambda t: t.get("review_count", 0), reverse=True)
+            themes = themes[:self.MAX_THEMES]
+
+            if themes:
+                with ThreadPoolExecutor(max_workers=len(themes)) as pool:
+                    enrichments = list(pool.map(lambda t: self._enrich_theme(t, reviews), themes))
+                themes = [{**theme, **extra} for theme, extra in zip(themes, enrichments)]
+
             # Validation via Pydantic
-            validated_output = ThemeOutput(**result_json)
+            validated_output = ThemeOutput(themes=themes)
             
             # Sort by volume and return top 3 as per requirements (though we keep 5 in internal storage)
             sorted_themes = sorted(validated_output.themes, key=lambda x: x.review_count, reverse=True)
@@ -151,6 +258,76 @@ class ThemeClusteringEngine:
             )
             return [dummy_theme]
 
+    def _select_theme_reviews(self, theme: Dict[str, Any], reviews: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Picks the reviews sharing the most words with the theme's label and
+        summary. Falls back to the leading reviews when nothing overlaps.
+        """
+        keywords = set(re.findall(r"[a-z0-9]{3,}", f"{theme.get('label', '')} {theme.get('summary', '')}".lower()))
+        scored = []
+        for idx, r in enumerate(reviews):
+            words = set(re.findall(r"[a-z0-9]{3,}", f"{r.get('title') or ''} {r['review_text']}".lower()))
+            overlap = len(keywords & words)
+            if overlap:
+                scored.append((-overlap, idx))
+        if not scored:
+            return reviews[:self.ENRICHMENT_SAMPLE_SIZE]
+        scored.sort()
+        return [reviews[idx] for _, idx in scored[:self.ENRICHMENT_SAMPLE_SIZE]]
+
+    def _enrich_theme(self, theme: Dict[str, Any], reviews: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Generates quotes and action ideas for one theme; empty lists on failure."""
+        subset = self._select_theme_reviews(theme, reviews)
+        prompt = self.ENRICHMENT_PROMPT.format(
+            label=theme.get("label", ""),
+            summary=theme.get("summary", ""),
+            reviews_text="\n".join(f"- [{r['rating']}*] {r.get('title') or ''}: {r['review_text']}" for r in subset)
+        )
+        try:
+            response = self._create_completion([
+                {"role": "system", "content": self.SYSTEM_MESSAGE},
+                {"role": "user", "content": prompt}
+            ])
+            result_json = json.loads(response.choices[0].message.content)
+            return {
+                "high_signal_quotes": result_json.get("high_signal_quotes", []),
+                "action_ideas": result_json.get("action_ideas", [])
+            }
+        except Exception as e:
+            # Theme validators pad missing quotes/actions with placeholders
+            logger.error(f"Theme enrichment failed for '{theme.get('label')}': {e}")
+            return {"high_signal_quotes": [], "action_ideas": []}
+
+    def _create_completion(self, messages: List[Dict[str, str]]):
+        """
+        Calls the chat completions API, retrying only transient failures
+        (rate limits, timeouts, 5xx) with jittered exponential backoff.
+        Gives up after MAX_ATTEMPTS or once RETRY_DEADLINE is spent; each
+        attempt's timeout is capped by the time left on the deadline.
+        """
+        started = time.monotonic()
+        for attempt in range(self.MAX_ATTEMPTS):
+            # Positive by construction: a failure only retries if the backoff ends before the deadline
+            timeout = min(self.REQUEST_TIMEOUT, self.RETRY_DEADLINE - (time.monotonic() - started))
+            try:
+                return self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=0.2, # Low temperature for deterministic output
+                    response_format={"type": "json_object"},
+                    timeout=timeout
+                )
+            except (RateLimitError, APITimeoutError, APIStatusError) as e:
+                retryable = isinstance(e, (RateLimitError, APITimeoutError)) or 500 <= e.status_code < 600
+                if not retryable:
+                    raise
+                delay = min(8, 2 ** attempt) + random.random()
+                if attempt == self.MAX_ATTEMPTS - 1 or time.monotonic() - started + delay >= self.RETRY_DEADLINE:
+                    raise
+                logger.warning(f"Transient OpenAI error ({type(e).__name__}), retrying in {delay:.1f}s "
+                               f"(attempt {attempt + 1}/{self.MAX_ATTEMPTS})")
+                time.sleep(delay)
+
 if __name__ == "__main__":
     # Test stub
     engine = ThemeClusteringEngine()
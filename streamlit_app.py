@@ -3,164 +3,268 @@ import os
 import json
 from datetime import datetime, timedelta
 import streamlit.components.v1 as components
-from PIL import Image
-from src.orchestrator import PulseOrchestrator
-from src.email_service import EmailService
 from src.db_init import ensure_initialized
+from utils.date_ranges import format_run_date_range, format_timestamp_label
+from utils.logger import setup_logger
 import concurrent.futures
-import time
+import queue
+import re
+from pathlib import Path
 
 # --- App Config ---
 st.set_page_config(page_title="Weekly App Review Pulse", layout="wide")
+logger = setup_logger("dashboard")
 
 # --- Brand Theme CSS ---
-st.markdown("""
-<style>
-    /* ===== Brand Colors =====
-       Brand Blue:            #5367F5
-       Brand Green (Logo):    #08F6B6
-       Brand Green (Primary): #00D09C
-       Brand Accent Blue A:   #B1D0FB
-       Brand Accent Blue B:   #E5F4FD
-    */
-
-    /* Primary buttons */
-    .stButton > button[kind="primary"],
-    div[data-testid="stFormSubmitButton"] > button {
-        background-color: #00D09C !important;
-        border-color: #00D09C !important;
-        color: #FFFFFF !important;
-    }
-    .stButton > button[kind="primary"]:hover,
-    div[data-testid="stFormSubmitButton"] > button:hover {
-        background-color: #08F6B6 !important;
-        border-color: #08F6B6 !important;
-    }
+@st.cache_resource
+def _brand_css():
+    """Reads assets/theme.css once per process, minified (comments and whitespace runs stripped)."""
+    with open("assets/theme.css", encoding="utf-8") as f:
+        css = re.sub(r"/\*.*?\*/", "", f.read(), flags=re.S)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", re.sub(r"\s+", " ", css)).strip()
+    return f"<style>{css}</style>"
 
-    /* Secondary / default buttons */
-    .stButton > button:not([kind="primary"]) {
-        border-color: #00D09C !important;
-        color: #0B0B21 !important;
-    }
-    .stButton > button:not([kind="primary"]):hover {
-        background-color: #EBFCF4 !important;
-        border-color: #00D09C !important;
-    }
+# st.html sends a style-only block straight to the page, skipping markdown
+# parsing and the empty element gap. It still has to be emitted on every rerun:
+# Streamlit removes any element a rerun doesn't re-emit.
+st.html(_brand_css())
 
-    /* Title styling */
-    h1 {
-        color: #0B0B21 !important;
-    }
 
-    /* Sidebar header */
-    [data-testid="stSidebar"] h1,
-    [data-testid="stSidebar"] h2 {
-        color: #5367F5 !important;
-    }
+@st.cache_resource
+def get_orchestrator():
+    # Imported lazily: the orchestrator pulls in the OpenAI SDK and scrapers,
+    # and is cached for the lifetime of the server anyway.
+    from src.orchestrator import PulseOrchestrator
+    return PulseOrchestrator()
 
-    /* Dividers */
-    hr {
-        border-color: #B1D0FB !important;
-    }
+@st.cache_resource
+def get_data_manager():
+    # Read paths (history, run rows, app list) only need SQLite, so a first
+    # render never has to import the orchestrator.
+    from src.data_manager import DataManager
+    return DataManager()
+
+def _pipeline_pool_size():
+    """PULSE_POOL_SIZE, clamped to >= 1; a blank or non-numeric value falls back to the default."""
+    default = min(8, (os.cpu_count() or 2) + 2)
+    raw = os.environ.get("PULSE_POOL_SIZE")
+    if raw is None:
+        return default
+    try:
+        size = int(raw)
+    except ValueError:
+        logger.warning(f"Ignoring non-numeric PULSE_POOL_SIZE={raw!r}; using {default} workers")
+        return default
+    if size < 1:
+        logger.warning(f"PULSE_POOL_SIZE={size} is below 1; using 1 worker")
+        return 1
+    return size
 
-    /* Links and accents */
-    a {
-        color: #5367F5 !important;
-    }
+@st.cache_resource
+def get_executor():
+    # Shared by every session; pipeline runs are I/O-bound (scraping, OpenAI, SQLite)
+    return concurrent.futures.ThreadPoolExecutor(max_workers=_pipeline_pool_size(), thread_name_prefix="pulse")
 
-    /* Success alerts */
-    div[data-testid="stAlert"][data-baseweb="notification"]:has([data-testid="stNotificationContentSuccess"]) {
-        background-color: #EBFCF4 !important;
-        border-left-color: #00D09C !important;
-    }
+@st.cache_resource
+def get_email_executor():
+    # Separate from the pipeline pool so a send never queues behind a running pipeline
+    return concurrent.futures.ThreadPoolExecutor(max_workers=1)
 
-    /* Error alerts */
-    div[data-testid="stAlert"][data-baseweb="notification"]:has([data-testid="stNotificationContentError"]) {
-        border-left-color: #5367F5 !important;
-    }
+# Email artifacts are keyed by (path, mtime) so a regenerated file is re-read,
+# while reruns reuse the cached copy instead of holding a fresh read per rerun.
+@st.cache_data(ttl=3600, show_spinner=False)
+def _load_email_bytes(path, mtime):
+    return Path(path).read_bytes()
 
-    /* Metric value */
-    [data-testid="stMetricValue"] {
-        color: #00D09C !important;
-    }
+@st.cache_data(ttl=3600, show_spinner=False)
+def _load_email_html(path, mtime):
+    return _load_email_bytes(path, mtime).decode('utf-8')
 
-    /* Bordered containers */
-    [data-testid="stVerticalBlock"] > div[data-testid="stExpander"],
-    div[data-testid="stVerticalBlockBorderWrapper"] {
-        border-color: #B1D0FB !important;
-    }
+@st.cache_data(ttl=3600, show_spinner=False)
+def _count_analysis_themes(path, mtime):
+    """Theme count from an analysis file; immutable once written, so keyed by (path, mtime)."""
+    with open(path, 'rb') as af:
+        return len(json.loads(af.read()))
 
-    /* Spinner */
-    .stSpinner > div {
-        border-top-color: #00D09C !important;
-    }
-</style>
-""", unsafe_allow_html=True)
+@st.cache_data(ttl=2, show_spinner=False)
+def _list_run_history(limit=30):
+    """Collapses duplicate history queries from rapid clicks and polls."""
+    return get_data_manager().list_run_history_for_ui(limit=limit)
 
+@st.cache_data(ttl=5, show_spinner=False)
+def _list_email_artifacts(processed_dir):
+    """Maps run_id -> (path, mtime) for every email report, from one scandir pass."""
+    artifacts = {}
+    if not os.path.isdir(processed_dir):
+        return artifacts
+    with os.scandir(processed_dir) as it:
+        for entry in it:
+            if entry.name.startswith("pulse_email_") and entry.name.endswith(".html") and entry.is_file():
+                run_id = entry.name.removeprefix("pulse_email_").removesuffix(".html")
+                artifacts[run_id] = (entry.path, entry.stat().st_mtime)
+    return artifacts
 
-@st.cache_resource
-def get_orchestrator():
-    return PulseOrchestrator()
 
-@st.cache_resource
-def get_executor():
-    return concurrent.futures.ThreadPoolExecutor(max_workers=1)
+_TERMINAL_STATUSES = ("succeeded", "failed")
+
+
+class _UncachedRunLog(LookupError):
+    """Raised for missing or in-flight runs so st.cache_data never stores them."""
+
+    def __init__(self, run_id, run_log=None):
+        super().__init__(run_id)
+        self.run_log = run_log or {}
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_run_log(run_id):
+    """Only terminal run rows are immutable; anything else raises with the fresh row attached."""
+    run_log = get_data_manager().get_run_log(run_id)
+    if not run_log or run_log.get('status') not in _TERMINAL_STATUSES:
+        raise _UncachedRunLog(run_id, run_log)
+    return run_log
 
 
 # --- Database Initialization (runs once per container; idempotent on reruns) ---
 ensure_initialized()
 
-orchestrator = get_orchestrator()
 executor = get_executor()
+email_executor = get_email_executor()
+
+if pending_toast := st.session_state.pop('_pending_toast', None):
+    st.toast(pending_toast, icon="🚀")
 
 
 # --- Query Param Handling (Deep Linking) ---
+def _ensure_deep_link_loaded(target_run_id):
+    """
+    Populates latest_result for a /?run_id= link. A no-op once that run is
+    loaded in a terminal state, so later reruns on the same page skip the disk
+    and DB checks; triggered/running runs are re-read until their stats land.
+    """
+    existing = st.session_state.get('latest_result')
+    if (existing and existing.get('run_id') == target_run_id
+            and existing.get('run_status') not in ('triggered', 'running')):
+        return
+
+    processed_dir = "data/processed"
+    analysis_path = os.path.join(processed_dir, f"analysis_{target_run_id}.json")
+    email_path = os.path.join(processed_dir, f"pulse_email_{target_run_id}.html")
+
+    # Try to load stats from DB first
+    try:
+        run_log = _cached_run_log(target_run_id)
+    except _UncachedRunLog as e:
+        run_log = e.run_log
+
+    # A succeeded run has written its email; otherwise check the cached directory scan
+    if run_log.get('status') != 'succeeded' and target_run_id not in _list_email_artifacts(processed_dir):
+        return
+
+    reviews_count = run_log.get('reviews_processed', 'N/A')
+    themes_count = run_log.get('themes_identified', 'N/A')
+
+    # Fallback to file reading if DB miss
+    if not run_log:
+        try:
+            themes_count = _count_analysis_themes(analysis_path, os.path.getmtime(analysis_path))
+        except (OSError, ValueError):
+            pass
+
+    st.session_state['latest_result'] = {
+        "status": "success",
+        "run_id": target_run_id,
+        "run_status": run_log.get('status'),
+        "reviews_count": reviews_count,
+        "themes_count": themes_count,
+        "artifacts": {
+            "email_html": email_path
+        }
+    }
+
 # Check if a specific report is requested via URL (e.g. /?run_id=2023-W23)
-query_params = st.query_params
-if "run_id" in query_params:
-    target_run_id = query_params["run_id"]
-    # Only load if not already loaded or different
-    if st.session_state.get('latest_result', {}).get('run_id') != target_run_id:
-        processed_dir = "data/processed"
-        analysis_path = os.path.join(processed_dir, f"analysis_{target_run_id}.json")
-        email_path = os.path.join(processed_dir, f"pulse_email_{target_run_id}.html")
-        
-        if os.path.exists(email_path):
-            t_count = 0
-            # Try to load stats from DB first
-            run_log = orchestrator.data_manager.get_run_log(target_run_id)
-            reviews_count = run_log.get('reviews_processed', 'N/A')
-            themes_count = run_log.get('themes_identified', 'N/A')
-
-            # Fallback to file reading if DB miss
-            if not run_log:
-                if os.path.exists(analysis_path):
-                    try:
-                        with open(analysis_path, 'r') as af:
-                            t_count = len(json.load(af))
-                            themes_count = t_count
-                    except: pass
-            
-            st.session_state['latest_result'] = {
-                "status": "success",
-                "run_id": target_run_id,
-                "reviews_count": reviews_count, 
-                "themes_count": themes_count,
-                "artifacts": {
-                    "email_html": email_path
-                }
-            }
+if "run_id" in st.query_params:
+    _ensure_deep_link_loaded(st.query_params["run_id"])
+
+_PURGED_SESSION_KEYS = (
+    'latest_result', 'pipeline_future', 'pipeline_progress', 'pipeline_phase',
+    'pipeline_run_id', 'pipeline_status', 'pipeline_error', '_toasted_run_id',
+    'purge_val', 'show_maintenance_drawer',
+)
+
+@st.fragment
+def _render_maintenance_drawer():
+    """
+    Isolated fragment: typing in the confirmation box only re-runs this drawer,
+    not the whole app. The typed value is checked when Confirm is clicked, since
+    a text_input only commits on Enter or blur.
+    """
+    with st.container(border=True):
+        st.error("⚠️ Critical Action: Purging all data.")
+        st.write("To confirm, please type **delete** below:")
+
+        st.text_input("Confirm Delete", placeholder="delete", label_visibility="collapsed", key="purge_val")
+
+        c1, c2 = st.columns(2)
+        with c1:
+            if st.button("Confirm", type="primary", use_container_width=True):
+                if st.session_state.get("purge_val", "").strip().lower() == "delete":
+                    with st.spinner("Purging all data..."):
+                        try:
+                            get_orchestrator().purge_all_data()
+                            _list_email_artifacts.clear()
+                            _list_run_history.clear()
+                            _cached_run_log.clear()
+                            # Drop only run state; the app selection and other UI keys survive.
+                            for key in _PURGED_SESSION_KEYS:
+                                st.session_state.pop(key, None)
+                            st.success("All data has been purged successfully!")
+                            st.rerun()
+                        except RuntimeError as e:
+                            st.error(f"⚠️ Purge blocked: {e}")
+                        except Exception as e:
+                            st.error(f"❌ Purge failed: {e}")
+                else:
+                    st.warning("Please type 'delete' to confirm.")
+
+        with c2:
+            if st.button("Cancel", use_container_width=True):
+                st.session_state.show_maintenance_drawer = False
+                st.rerun()
+
 
 # --- Page Header ---
 st.title("Weekly App Review Pulse")
 st.markdown("Automated sentiment analysis and executive reporting for app store reviews.")
 
+@st.fragment(run_every=1 if 'pipeline_future' in st.session_state else None)
+def _render_pipeline_status():
+    """
+    Polls the background pipeline once a second and shows its current stage.
+    Streamlit commands are ignored off the script thread, so the finished
+    future is collected by a full rerun rather than a done-callback.
+    """
+    future = st.session_state.get('pipeline_future')
+    if future is None:
+        return
+    progress = st.session_state.get('pipeline_progress')
+    while progress is not None and not progress.empty():
+        st.session_state['pipeline_phase'] = progress.get_nowait()
+    if future.done():
+        st.rerun()
+    st.status(st.session_state.get('pipeline_phase', "Running pipeline..."), state="running")
+
 # --- Async Pipeline Status Check (placed AFTER header to avoid displacing title) ---
 if 'pipeline_future' in st.session_state:
     future = st.session_state['pipeline_future']
     if future.done():
         # Clear future FIRST — prevents re-entry on subsequent reruns caused by polling
         del st.session_state['pipeline_future']
+        st.session_state.pop('pipeline_progress', None)
+        st.session_state.pop('pipeline_phase', None)
+        # Show the finished run and its report right away rather than after the cache TTLs
+        _list_run_history.clear()
+        _list_email_artifacts.clear()
         try:
             result = future.result()
             if result["status"] == "success":
@@ -181,14 +285,31 @@ if 'pipeline_future' in st.session_state:
             st.session_state['pipeline_status'] = 'failed'
             st.session_state['pipeline_error'] = str(e)
 
+# --- Async Email Send Check ---
+if 'email_future' in st.session_state:
+    email_future = st.session_state['email_future']
+    if email_future.done():
+        del st.session_state['email_future']
+        recipient = st.session_state.pop('email_recipient', '')
+        try:
+            sent = email_future.result()
+        except Exception:
+            sent = False
+        if sent:
+            st.balloons()
+            st.toast(f"Email successfully sent to {recipient}!", icon="✅")
+        else:
+            st.toast("Failed to send email. Please check your SMTP configuration.", icon="❌")
+
+# Called after the done-checks above, so a finished future is already collected
+_render_pipeline_status()
+
 # --- Sidebar ---
 with st.sidebar:
     st.header("Pipeline Configuration")
 
     # Application Selection (fetched live from the applications table)
-    from src.data_manager import DataManager
-    _dm = DataManager()
-    app_records = _dm.get_all_applications()
+    app_records = get_data_manager().get_all_applications()
     app_names = [app["app_name"] for app in app_records]
     
     if not app_names:
@@ -399,10 +520,7 @@ function selectApp(name) {{
             st.error("Error: Start date must be before end date.")
         else:
             # Prepare Custom Run ID for instant feedback
-            timestamp = datetime.now().strftime('%H%M%S')
-            start_str = start_date.strftime('%Y%m%d')
-            end_str = end_date.strftime('%Y%m%d')
-            custom_run_id = f"custom_{start_str}_{end_str}_{timestamp}"
+            custom_run_id = get_orchestrator().make_custom_run_id(start_date, end_date)
 
             # Store selected app so the orchestrator can use it
             st.session_state['selected_app'] = selected_app
@@ -411,20 +529,25 @@ function selectApp(name) {{
             dt_start = datetime.combine(start_date, datetime.min.time())
             dt_end = datetime.combine(end_date, datetime.max.time())
             
+            # Stage messages are pushed from the worker thread and drained by _render_pipeline_status
+            progress = queue.Queue()
             future = executor.submit(
-                orchestrator.run_pipeline,
+                get_orchestrator().run_pipeline,
                 start_date=dt_start,
                 end_date=dt_end,
                 run_id=custom_run_id,
-                app_name=selected_app
+                app_name=selected_app,
+                progress_cb=progress.put
             )
             
             st.session_state['pipeline_future'] = future
+            st.session_state['pipeline_progress'] = progress
+            st.session_state['pipeline_phase'] = "Pipeline queued..."
             st.session_state['pipeline_run_id'] = custom_run_id
             st.session_state['pipeline_status'] = 'running'
             
-            st.toast(f"Pipeline triggered: {custom_run_id}", icon="🚀")
-            time.sleep(1) # Brief pause to let toast show
+            # Shown on the next run; a toast emitted right before st.rerun() would be lost
+            st.session_state['_pending_toast'] = f"Pipeline triggered: {custom_run_id}"
             st.rerun()
 
     # --- Maintenance Section ---
@@ -436,151 +559,104 @@ function selectApp(name) {{
         st.session_state.show_maintenance_drawer = not st.session_state.get('show_maintenance_drawer', False)
 
     if st.session_state.get('show_maintenance_drawer'):
-        with st.container(border=True):
-            st.error("⚠️ Critical Action: Purging all data.")
-            st.write("To confirm, please type **delete** below:")
-
-            st.text_input("Confirm Delete", placeholder="delete", label_visibility="collapsed", key="purge_val")
-
-            c1, c2 = st.columns(2)
-            with c1:
-                if st.button("Confirm", type="primary", use_container_width=True):
-                    if st.session_state.get("purge_val", "").strip().lower() == "delete":
-                        with st.spinner("Purging all data..."):
-                            try:
-                                orchestrator.purge_all_data()
-                                st.session_state.clear()
-                                st.success("All data has been purged successfully!")
-                                st.rerun()
-                            except RuntimeError as e:
-                                st.error(f"⚠️ Purge blocked: {e}")
-                            except Exception as e:
-                                st.error(f"❌ Purge failed: {e}")
-                    else:
-                        st.warning("Please type 'delete' to confirm.")
-
-            with c2:
-                if st.button("Cancel", use_container_width=True):
-                    st.session_state.show_maintenance_drawer = False
-                    st.rerun()
-
-            # JS Bridge: Live reactivity for purge confirmation
-            components.html(
-                f"""
-                <script>
-                const doc = window.parent.document;
-                const check = () => {{
-                    const inputs = doc.querySelectorAll('input[aria-label="Confirm Delete"]');
-                    const buttons = doc.querySelectorAll('button');
-                    const targetInput = Array.from(inputs).find(i => i.placeholder === "delete");
-                    const targetBtn = Array.from(buttons).find(b => b.innerText.includes("Confirm"));
-
-                    if (targetInput && targetBtn) {{
-                        // 1. Set initial state based on current value
-                        targetBtn.disabled = targetInput.value.toLowerCase() !== 'delete';
-                        
-                        // 2. Add listener for future changes
-                        targetInput.addEventListener('input', (e) => {{
-                            targetBtn.disabled = e.target.value.toLowerCase() !== 'delete';
-                        }});
-                    }}
-                }};
-                setInterval(check, 100);
-                </script>
-                """,
-                height=0
-            )
-
-@st.fragment(run_every=5)
+        _render_maintenance_drawer()
+
+STATUS_EMOJI = {
+    "triggered": "🟡 Triggered",
+    "running":   "🔵 Running",
+    "succeeded": "🟢 Succeeded",
+    "failed":    "🔴 Failed",
+}
+
+# Poll only while a run is in flight: either this session's pipeline future,
+# or a recent triggered/running row (another session's run). Rows older than
+# STALE_RUN_MINUTES are treated as crashed runs, so they can't keep every session
+# polling forever. The decorator argument is re-evaluated on every full rerun.
+HISTORY_POLL_SECONDS = 2
+STALE_RUN_MINUTES = 30
+
+def _history_needs_polling(all_runs):
+    pending_future = st.session_state.get('pipeline_future')
+    if pending_future is not None and not pending_future.done():
+        return True
+    cutoff = (datetime.now() - timedelta(minutes=STALE_RUN_MINUTES)).isoformat()
+    # triggered_at is an ISO timestamp, so string comparison orders it correctly
+    return any(r.get("status") in ("triggered", "running") and (r.get("triggered_at") or "") >= cutoff
+               for r in all_runs)
+
+# Recomputed here, after any finished future was collected above, so the run
+# that reaps the future also switches the timer off without an extra rerun.
+st.session_state['_history_polling'] = _history_needs_polling(_list_run_history(limit=30))
+
+@st.fragment(run_every=HISTORY_POLL_SECONDS if st.session_state['_history_polling'] else None)
 def _render_history_table():
     """
-    Isolated fragment: only this function re-runs every 5 s.
+    Isolated fragment: only this function re-runs while a pipeline is in flight.
     The sidebar, header, and report viewer are never touched between polls.
     """
     st.subheader("📂 Report History")
     processed_dir = "data/processed"
 
-    all_runs = orchestrator.data_manager.list_run_history(limit=30)
+    all_runs = _list_run_history(limit=30)
+    email_artifacts = _list_email_artifacts(processed_dir)
 
-    in_progress = any(r.get("status") in ("triggered", "running") for r in all_runs)
-    # When nothing is in-flight, st.fragment still renders on user interactions;
-    # the run_every timer simply keeps the table refreshed passively.
-
-    STATUS_EMOJI = {
-        "triggered": "🟡 Triggered",
-        "running":   "🔵 Running",
-        "succeeded": "🟢 Succeeded",
-        "failed":    "🔴 Failed",
-    }
+    should_poll = _history_needs_polling(all_runs)
 
     if all_runs:
-        h1, h2, h3, h4, h5, h6 = st.columns([1, 4, 2, 3, 2, 2], vertical_alignment="center")
-        h1.markdown("**S.No.**")
-        h2.markdown("**Run ID**")
-        h3.markdown("**Status**")
-        h4.markdown("**Date Range**")
-        h5.markdown("**Triggered On**")
-        h6.markdown("**Download**")
-        st.markdown("<hr style='margin: 0; padding: 0;'>", unsafe_allow_html=True)
-
+        # One dataframe instead of a row of columns/widgets per run keeps each poll to a single element
+        rows = []
         for row_idx, run in enumerate(all_runs, start=1):
             run_id  = run["run_id"]
             status  = run.get("status", "succeeded")
-            badge   = STATUS_EMOJI.get(status, status)
-
-            # --- Date range ---
-            date_range_str = "-"
-            try:
-                if run_id.startswith("custom_"):
-                    parts = run_id.split('_')
-                    if len(parts) >= 3:
-                        s = datetime.strptime(parts[1], "%Y%m%d")
-                        e = datetime.strptime(parts[2], "%Y%m%d")
-                        date_range_str = f"{s.strftime('%b %d')} - {e.strftime('%b %d %Y')}"
-                elif "-W" in run_id:
-                    year, week = run_id.split("-W")
-                    week_start = datetime.strptime(f"{year}-W{week}-1", "%Y-W%W-%w")
-                    date_range_str = f"{week_start.strftime('%b %d')} - {(week_start + timedelta(days=6)).strftime('%b %d %Y')}"
-                elif run.get("start_date") and run.get("end_date"):
-                    s = datetime.fromisoformat(run["start_date"])
-                    e = datetime.fromisoformat(run["end_date"])
-                    date_range_str = f"{s.strftime('%b %d')} - {e.strftime('%b %d %Y')}"
-            except Exception:
-                pass
-
-            # --- Triggered-at ---
-            triggered_label = "-"
-            if run.get("triggered_at"):
-                try:
-                    triggered_label = datetime.fromisoformat(run["triggered_at"]).strftime("%b %d, %Y %I:%M %p")
-                except Exception:
-                    triggered_label = run["triggered_at"][:16]
-
-            # --- Email file ---
-            email_path = os.path.join(processed_dir, f"pulse_email_{run_id}.html")
-            has_file   = os.path.exists(email_path)
-
-            c1, c2, c3, c4, c5, c6 = st.columns([1, 4, 2, 3, 2, 2], vertical_alignment="center")
-            with c1: st.markdown(f"**{row_idx}**")
-            with c2:
-                if has_file:
-                    st.markdown(f'<a href="/?run_id={run_id}" target="_self" style="text-decoration:underline">{run_id}</a>', unsafe_allow_html=True)
-                else:
-                    st.markdown(run_id)
-            with c3: st.markdown(badge)
-            with c4: st.markdown(date_range_str)
-            with c5: st.markdown(triggered_label)
-            with c6:
-                if has_file:
-                    with open(email_path, 'r', encoding='utf-8') as fp:
-                        st.download_button("⬇", fp.read(), file_name=f"pulse_email_{run_id}.html",
-                                           mime="text/html", key=f"dl_html_{run_id}")
-                else:
-                    st.caption("—")
-            st.markdown("<hr style='margin: 0; padding: 0;'>", unsafe_allow_html=True)
+
+            rows.append({
+                "S.No.":        row_idx,
+                "Run ID":       run_id,
+                "Status":       STATUS_EMOJI.get(status, status),
+                "Date Range":   format_run_date_range(run_id, run.get("start_date"), run.get("end_date")),
+                "Triggered On": format_timestamp_label(run.get("triggered_at")),
+                "Report":       "📄 View" if run_id in email_artifacts else "—",
+            })
+
+        # Row selection instead of link cells: a LinkColumn opens a new tab and
+        # loses the session, so navigate in place via the query param.
+        event = st.dataframe(
+            rows,
+            hide_index=True,
+            use_container_width=True,
+            on_select="rerun",
+            selection_mode="single-row",
+            key="history_table",
+            column_config={
+                "S.No.": st.column_config.NumberColumn(width="small"),
+            },
+        )
+        st.caption("Select a row with a report to open it.")
+
+        selected = event.selection.rows
+        if selected and rows[selected[0]]["Run ID"] in email_artifacts:
+            st.query_params["run_id"] = rows[selected[0]]["Run ID"]
+            st.rerun(scope="app")
     else:
         st.caption("No historical reports found yet. Generate your first pulse report to get started.")
 
+    # Polling state changed (a run started or finished): rerun the whole app so
+    # the fragment timer is rescheduled and a finished future is collected.
+    if should_poll != st.session_state.get('_history_polling', False):
+        st.session_state['_history_polling'] = should_poll
+        st.rerun()
+
+
+@st.fragment(run_every=1 if 'email_future' in st.session_state else None)
+def _render_email_send_status():
+    """Polls the background send; a full rerun surfaces the result once it finishes."""
+    future = st.session_state.get('email_future')
+    if future is None:
+        return
+    if future.done():
+        st.rerun()
+    st.caption(f"📨 Sending email to {st.session_state.get('email_recipient', '')}...")
+
 
 # --- Main Content Area ---
 if 'latest_result' in st.session_state:
@@ -598,15 +674,20 @@ if 'latest_result' in st.session_state:
         st.header("📧 Draft Email Report")
             
         email_path = res.get('artifacts', {}).get('email_html', '')
-        if email_path and os.path.exists(email_path):
-            with open(email_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
+        html_content = None  # stays None when there is no report to preview or send
+        try:
+            email_mtime = os.path.getmtime(email_path) if email_path else None
+        except OSError:
+            email_mtime = None
+        if email_mtime is not None:
+            html_content = _load_email_html(email_path, email_mtime)
 
             components.html(html_content, height=600, scrolling=True)
 
             st.download_button(
                 label="Download HTML Email",
-                data=html_content,
+                # Bytes come from the (path, mtime) cache, so reruns don't re-read the file
+                data=_load_email_bytes(email_path, email_mtime),
                 file_name=os.path.basename(email_path),
                 mime="text/html"
             )
@@ -614,23 +695,24 @@ if 'latest_result' in st.session_state:
     with col2:
         st.header("📤 Send Report")
         target_email = st.text_input("Enter recipient email:")
-        if st.button("Send Email", use_container_width=True):
-            if target_email and email_path and os.path.exists(email_path):
-                with st.spinner("Sending email..."):
-                    success = EmailService.send_email(
-                        to_email=target_email,
-                        subject=f"Weekly App Review Pulse - {datetime.now().strftime('%B %d, %Y')}",
-                        html_content=html_content
-                    )
-                    if success:
-                        st.balloons()
-                        st.success("Email successfully sent!")
-                    else:
-                        st.error("Failed to send email. Please check your SMTP configuration.")
+        sending = 'email_future' in st.session_state
+        if st.button("Send Email", use_container_width=True, disabled=sending):
+            if target_email and html_content is not None:
+                from src.email_service import EmailService
+                # Runs in the background; _render_email_send_status polls until it completes
+                st.session_state['email_future'] = email_executor.submit(
+                    EmailService.send_email,
+                    to_email=target_email,
+                    subject=f"Weekly App Review Pulse - {datetime.now().strftime('%B %d, %Y')}",
+                    html_content=html_content
+                )
+                st.session_state['email_recipient'] = target_email
+                st.rerun()
             elif not target_email:
                 st.warning("Please enter a valid email address.")
             else:
                 st.warning("No email report available to send.")
+        _render_email_send_status()
 
         st.divider()
         st.header("📊 Run Details")
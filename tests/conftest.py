@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import MagicMock
-import json
+import shutil
+from src.data_manager import DataManager
 
 @pytest.fixture
 def mock_openai_response():
@@ -36,3 +37,17 @@ def raw_reviews_sample():
         {"review_text": "Very intuitive interface.", "rating": 4, "date": "2024-01-02", "platform": "android"},
         {"review_text": "Slow loading on 4G.", "rating": 2, "date": "2024-01-03", "platform": "android"}
     ]
+
+@pytest.fixture(scope="session")
+def template_db(tmp_path_factory):
+    """Schema built once per session; per-test databases are file copies of it."""
+    path = tmp_path_factory.mktemp("template") / "pulse.db"
+    DataManager(db_path=str(path))
+    return path
+
+@pytest.fixture
+def db(tmp_path, template_db):
+    """Each test gets its own isolated SQLite file under pytest's tmp_path."""
+    test_db = tmp_path / "test_pulse.db"
+    shutil.copyfile(template_db, test_db)
+    return DataManager(db_path=str(test_db))
@@ -3,11 +3,12 @@ import os
 import json
 from src.orchestrator import PulseOrchestrator
 
-def test_pulse_orchestrator_initialization():
+def test_pulse_orchestrator_initialization(tmp_path, monkeypatch):
     """Verify directories are created on init."""
+    monkeypatch.chdir(tmp_path)
     orch = PulseOrchestrator()
-    assert os.path.exists('data/raw')
-    assert os.path.exists('data/processed')
+    assert (tmp_path / "data" / "raw").is_dir()
+    assert (tmp_path / "data" / "processed").is_dir()
 
 def test_idempotency_manifest_logic(tmp_path):
     """Verify that the manifest correctly tracks weeks."""
@@ -31,10 +32,13 @@ def test_idempotency_manifest_logic(tmp_path):
         week_id = orch._get_week_id()
         assert week_id in data["completed_weeks"]
 
-def test_pipeline_error_handling():
+def test_pipeline_error_handling(tmp_path, monkeypatch):
     """Verify that errors are caught and reported with stage."""
+    monkeypatch.chdir(tmp_path)
     orch = PulseOrchestrator()
-    # Mock a failure by passing invalid weeks_back
-    orch.weeks_back = -1 
-    result = orch.run_pipeline(force=True)
-    assert result["status"] in ["failed", "skipped", "success"] # Depending on internal checks
+    # A fresh database has no registered applications, so Scraping fails fast
+    result = orch.run_pipeline(force=True, run_id="err-run")
+    assert result["status"] == "failed"
+    assert result["stage"] == "Scraping"
+    assert "No applications registered" in result["error"]
+    assert orch.data_manager.get_run_log("err-run")["status"] == "failed"
@@ -1,17 +1,5 @@
 import pytest
-from datetime import datetime, timedelta
-from src.data_manager import DataManager
-import os
-
-@pytest.fixture
-def db(tmp_path):
-    """Each test gets its own isolated SQLite file under pytest's tmp_path."""
-    test_db = str(tmp_path / "test_pulse.db")
-    manager = DataManager()
-    manager.DB_PATH = test_db
-    manager._init_db()
-    yield manager
-    # tmp_path is automatically cleaned up by pytest — no manual removal needed
+from datetime import datetime
 
 def test_save_and_get_reviews(db):
     reviews = [
@@ -25,6 +13,26 @@ def test_save_and_get_reviews(db):
     assert len(cached) == 2
     assert any(r['review_text'] == "Great app!" for r in cached)
 
+def test_save_reviews_counts_only_new_rows(db):
+    reviews = [
+        {"platform": "ios", "rating": 5, "reviewText": "Great app!", "date": datetime(2024, 1, 1).isoformat()},
+        {"platform": "ios", "rating": 3, "reviewText": "Okay", "date": datetime(2024, 1, 1).isoformat()},
+        {"platform": "ios", "rating": 1},  # missing date: skipped, batch still saved
+    ]
+    assert db.save_reviews(reviews) == 2
+    assert db.save_reviews(reviews[:1]) == 0
+
+def test_save_reviews_keeps_good_rows_when_sqlite_rejects_one(db):
+    day = datetime(2024, 1, 1).isoformat()
+    reviews = [
+        {"platform": "ios", "rating": 5, "reviewText": "Great app!", "date": day},
+        {"platform": "ios", "rating": [1, 2], "reviewText": "Bad rating", "date": day},  # unbindable
+        {"platform": "ios", "rating": 3, "reviewText": "Okay", "date": day},
+    ]
+    assert db.save_reviews(reviews) == 2
+    cached = db.get_cached_reviews(datetime(2024, 1, 1), datetime(2024, 1, 2))
+    assert sorted(r['review_text'] for r in cached) == ["Great app!", "Okay"]
+
 def test_missing_ranges(db):
     start = datetime(2024, 1, 1)
     end = datetime(2024, 1, 10)
@@ -50,7 +58,7 @@ def test_missing_ranges(db):
 # --- Regression tests for pipeline visibility fix ---
 
 def test_upsert_run_log_no_duplicate(db):
-    """Double-upsert with same run_id must produce exactly one row (INSERT OR REPLACE)."""
+    """Double-upsert with same run_id must produce exactly one row (ON CONFLICT upsert)."""
     now = datetime.now().isoformat()
     db.upsert_run_log({"run_id": "r1", "status": "triggered", "triggered_at": now})
     db.upsert_run_log({"run_id": "r1", "status": "running",   "triggered_at": now})
@@ -109,3 +117,10 @@ def test_purge_blocked_by_active_job(db):
     assert db.get_run_log("rp2")["status"] == "running", \
         "Active job row must survive a blocked purge"
 
+def test_list_run_history_for_ui_projects_display_columns(db):
+    db.upsert_run_log({"run_id": "old", "status": "succeeded", "triggered_at": "2024-01-01T10:00:00",
+                       "error_message": None, "reviews_processed": 12})
+    db.upsert_run_log({"run_id": "new", "status": "running", "triggered_at": "2024-01-02T10:00:00"})
+    runs = db.list_run_history_for_ui(limit=10)
+    assert [r["run_id"] for r in runs] == ["new", "old"]
+    assert set(runs[0]) == {"run_id", "status", "start_date", "end_date", "triggered_at"}
@@ -0,0 +1,30 @@
+from datetime import datetime, timedelta
+from utils.date_ranges import format_run_date_range, format_timestamp_label
+
+def test_custom_run_id_range():
+    assert format_run_date_range("custom_20240101_20240107_120000") == "Jan 01 - Jan 07 2024"
+
+def test_same_second_custom_run_ids_are_distinct():
+    from src.orchestrator import PulseOrchestrator
+    start, end = datetime(2024, 1, 1), datetime(2024, 1, 7)
+    ids = {PulseOrchestrator.make_custom_run_id(start, end) for _ in range(50)}
+    assert len(ids) == 50
+    assert all(format_run_date_range(run_id) == "Jan 01 - Jan 07 2024" for run_id in ids)
+
+def test_weekly_run_id_matches_strftime_week():
+    # Weekly ids come from strftime("%Y-W%W"); the week start must round-trip
+    for day in range(0, 730, 3):
+        d = datetime(2023, 1, 1) + timedelta(days=day)
+        run_id = d.strftime("%Y-W%W")
+        week_start = datetime.strptime(f"{run_id}-1", "%Y-W%W-%w")
+        expected = f"{week_start.strftime('%b %d')} - {(week_start + timedelta(days=6)).strftime('%b %d %Y')}"
+        assert format_run_date_range(run_id) == expected
+
+def test_falls_back_to_row_dates_and_placeholder():
+    assert format_run_date_range("scheduled", "2024-03-01", "2024-03-08", sep=" – ") == "Mar 01 – Mar 08 2024"
+    assert format_run_date_range("custom_bad_id") == "-"
+
+def test_timestamp_label():
+    assert format_timestamp_label("2024-01-01T15:04:05") == "Jan 01, 2024 03:04 PM"
+    assert format_timestamp_label(None) == "-"
+    assert format_timestamp_label("not-a-timestamp-at-all") == "not-a-timestamp-"
@@ -13,6 +13,19 @@ def test_pipeline_zero_reviews_graceful_exit():
             assert result["status"] == "failed"
             assert "No reviews found" in result["error"]
 
+def test_pipeline_reports_stage_progress(tmp_path, monkeypatch):
+    """Verify that stage messages reach the progress callback."""
+    monkeypatch.chdir(tmp_path)
+    orch = PulseOrchestrator()
+    phases = []
+
+    with patch('src.scraper_engine.ScraperEngine.scrape_app_store', return_value=[]):
+        with patch('src.scraper_engine.ScraperEngine.scrape_play_store', return_value=[]):
+            result = orch.run_pipeline(force=True, progress_cb=phases.append)
+
+    assert result["status"] == "failed"
+    assert phases and phases[0].startswith("Stage 1/4")
+
 def test_noisy_review_cleaning():
     """Verify that the cleaner handles extreme noise/emojis/garbage."""
     from src.pii_cleaner import PIICleaner
@@ -1,14 +1,15 @@
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 from src.email_service import EmailService
 
-@patch("src.email_service.smtplib.SMTP")
-def test_email_service_send_success(mock_smtp):
+@pytest.fixture
+def smtp_mock():
+    """Autospecced SMTP class; the connected server is its return_value."""
+    with patch("src.email_service.smtplib.SMTP", autospec=True) as mock_smtp:
+        yield mock_smtp.return_value
+
+def test_email_service_send_success(smtp_mock):
     """Verify that send_email calls SMTP correctly on success."""
-    # Setup mock
-    mock_server = MagicMock()
-    mock_smtp.return_value.__enter__.return_value = mock_server
-    
     # Mock environment variables
     with patch.dict("os.environ", {
         "SMTP_SERVER": "smtp.test.com",
@@ -24,16 +25,13 @@ def test_email_service_send_success(mock_smtp):
         )
         
         assert success is True
-        mock_server.starttls.assert_called_once()
-        mock_server.login.assert_called_once_with("test@test.com", "password")
-        mock_server.sendmail.assert_called_once()
+        smtp_mock.starttls.assert_called_once()
+        smtp_mock.login.assert_called_once_with("test@test.com", "password")
+        smtp_mock.sendmail.assert_called_once()
 
-@patch("src.email_service.smtplib.SMTP")
-def test_email_service_send_failure(mock_smtp):
+def test_email_service_send_failure(smtp_mock):
     """Verify that send_email handles SMTP exceptions gracefully."""
-    mock_server = MagicMock()
-    mock_server.login.side_effect = Exception("Auth failed")
-    mock_smtp.return_value.__enter__.return_value = mock_server
+    smtp_mock.login.side_effect = Exception("Auth failed")
     
     with patch.dict("os.environ", {
         "SMTP_USERNAME": "test@test.com",
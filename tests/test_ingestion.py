@@ -1,7 +1,7 @@
 import pytest
 from datetime import datetime, timedelta
 from src.pii_cleaner import PIICleaner
-from src.ingestion import ReviewSchema, IngestionModule
+from src.ingestion import ReviewSchema, IngestionModule, parse_many
 import csv
 import os
 
@@ -34,6 +34,16 @@ def test_review_validation_schema():
     with pytest.raises(ValueError):
         ReviewSchema(rating=6, review_text="Bad rating", date=datetime.now())
 
+def test_parse_many_drops_only_invalid_rows():
+    rows = [
+        {"rating": 5, "review_text": "Mail me at a@b.com", "date": "2024-01-01"},
+        {"rating": 9, "review_text": "Out of range", "date": "2024-01-01"},
+        {"rating": 3, "review_text": "Fine", "date": "2024-01-02"},
+    ]
+    parsed = parse_many(rows)
+    assert [r.rating for r in parsed] == [5, 3]
+    assert parsed[0].review_text == "Mail me at [EMAIL]"
+
 def test_ingestion_filtering(tmp_path):
     # Create sample CSV
     d = tmp_path / "data"
@@ -51,7 +61,7 @@ def test_ingestion_filtering(tmp_path):
         writer.writerow({'rating': 3, 'title': 'Duplicate', 'review_text': 'Perfectly fine', 'date': new_date})
     
     module = IngestionModule(weeks_back=12)
-    results = module.process_csv(str(csv_file))
+    results = list(module.process_csv(str(csv_file)))
     
     # Should only have the 'New' one (Old is filtered, Duplicate is dropped)
     assert len(results) == 1
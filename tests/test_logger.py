@@ -0,0 +1,46 @@
+import gzip
+import logging
+from logging.handlers import QueueHandler, RotatingFileHandler
+from utils import logger as logger_module
+from utils.logger import setup_logger
+
+def test_file_logging_goes_through_queue(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    log = setup_logger("test_queue_logger", log_file="queued.log", level=logging.INFO)
+    assert any(isinstance(h, QueueHandler) for h in log.handlers)
+    assert not any(isinstance(h, RotatingFileHandler) for h in log.handlers)
+
+    log.info("hello from the pipeline")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        log.exception("stage failed")
+
+    # Stopping the listener flushes everything still queued
+    logger_module._file_listeners.pop("queued.log").stop()
+    text = (tmp_path / "logs" / "queued.log").read_text()
+    assert "test_queue_logger - INFO" in text
+    assert "hello from the pipeline" in text
+    assert "ValueError: boom" in text
+    assert text.count("stage failed") == 1
+
+def test_setup_logger_idempotent(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    first = setup_logger("test_idempotent_logger", log_file="idempotent.log")
+    second = setup_logger("test_idempotent_logger", log_file="idempotent.log")
+    assert first is second
+    assert len(second.handlers) == 2
+    logger_module._file_listeners.pop("idempotent.log").stop()
+
+def test_rotated_logs_are_gzipped(tmp_path):
+    path = tmp_path / "rotating.log"
+    handler = logger_module._rotating_file_handler(str(path), logging.Formatter("%(message)s"))
+    handler.maxBytes = 64
+    record = logging.LogRecord("rot", logging.INFO, __file__, 1, "x" * 40, None, None)
+    for _ in range(4):
+        handler.emit(record)
+    handler.close()
+
+    backups = sorted(p.name for p in tmp_path.iterdir() if p.name != "rotating.log")
+    assert backups and all(name.endswith(".gz") for name in backups)
+    assert gzip.decompress((tmp_path / "rotating.log.1.gz").read_bytes()).startswith(b"x" * 40)
@@ -1,5 +1,8 @@
 import pytest
-from src.theme_engine import ThemeOutput, Theme
+import json
+from unittest.mock import MagicMock, patch
+from openai import RateLimitError, APITimeoutError
+from src.theme_engine import ThemeOutput, Theme, ThemeClusteringEngine
 
 def test_theme_count_validation_truncates():
     # Attempt to create with 6 themes
@@ -31,3 +34,124 @@ def test_deterministic_sorting():
     # Ensure sorting works as expected in the engine (tested manually in usage)
     sorted_themes = sorted(output.themes, key=lambda x: x.review_count, reverse=True)
     assert sorted_themes[0].label == "Most Popular"
+
+def _rate_limit_error():
+    return RateLimitError("rate limited", response=MagicMock(status_code=429), body=None)
+
+def test_cluster_reviews_retries_transient_errors(mock_openai_response, raw_reviews_sample):
+    payload = json.dumps({"themes": [{
+        "label": "Slow Loading", "review_count": 1, "summary": "Loading is slow.",
+        "sentiment": "Negative", "business_impact": "Churn risk."
+    }]})
+    enrichment = json.dumps({"high_signal_quotes": ["Slow loading on 4G.", "Q2", "Q3"], "action_ideas": ["A1", "A2", "A3"]})
+    engine = ThemeClusteringEngine(api_key="test-key")
+    engine.client = MagicMock()
+    engine.client.chat.completions.create.side_effect = [
+        _rate_limit_error(), mock_openai_response(payload), mock_openai_response(enrichment)
+    ]
+    reviews = [dict(r, title="") for r in raw_reviews_sample]
+
+    with patch("src.theme_engine.time.sleep") as mock_sleep:
+        themes = engine.cluster_reviews(reviews)
+
+    assert engine.client.chat.completions.create.call_count == 3
+    mock_sleep.assert_called_once()
+    assert themes[0].label == "Slow Loading"
+    assert themes[0].high_signal_quotes[0] == "Slow loading on 4G."
+
+def test_cluster_reviews_falls_back_after_retries_exhausted(raw_reviews_sample):
+    engine = ThemeClusteringEngine(api_key="test-key")
+    engine.client = MagicMock()
+    engine.client.chat.completions.create.side_effect = _rate_limit_error()
+    reviews = [dict(r, title="") for r in raw_reviews_sample]
+
+    with patch("src.theme_engine.time.sleep"):
+        themes = engine.cluster_reviews(reviews)
+
+    assert engine.client.chat.completions.create.call_count == engine.MAX_ATTEMPTS
+    assert themes[0].label == "General Feedback"
+
+def test_create_completion_caps_attempts_by_retry_deadline():
+    engine = ThemeClusteringEngine(api_key="test-key")
+    assert engine.client.max_retries == 0
+
+    clock = {"now": 0.0}
+    timeouts = []
+
+    def time_out(**kwargs):
+        # Each attempt hangs for its full timeout before failing
+        timeouts.append(kwargs["timeout"])
+        clock["now"] += kwargs["timeout"]
+        raise APITimeoutError(request=MagicMock())
+
+    def sleep(delay):
+        clock["now"] += delay
+
+    engine.client = MagicMock()
+    engine.client.chat.completions.create.side_effect = time_out
+    with patch("src.theme_engine.time.monotonic", side_effect=lambda: clock["now"]), \
+         patch("src.theme_engine.time.sleep", side_effect=sleep), \
+         patch("src.theme_engine.random.random", return_value=0.0):
+        with pytest.raises(APITimeoutError):
+            engine._create_completion([{"role": "user", "content": "hi"}])
+
+    assert timeouts == [engine.REQUEST_TIMEOUT, engine.RETRY_DEADLINE - engine.REQUEST_TIMEOUT - 1]
+    assert clock["now"] <= engine.RETRY_DEADLINE
+
+def test_cluster_reviews_enriches_each_theme_with_relevant_reviews(mock_openai_response, raw_reviews_sample):
+    themes_payload = json.dumps({"themes": [
+        {"label": "Slow Loading", "review_count": 1, "summary": "Pages are slow on 4G.",
+         "sentiment": "Negative", "business_impact": "Churn risk."},
+        {"label": "Intuitive Interface", "review_count": 2, "summary": "Users find the UI great.",
+         "sentiment": "Positive", "business_impact": "Retention driver."}
+    ]})
+
+    def respond(model, messages, **kwargs):
+        prompt = messages[-1]["content"]
+        if '"themes"' in prompt:
+            return mock_openai_response(themes_payload)
+        if "Slow Loading" in prompt:
+            return mock_openai_response(json.dumps({"high_signal_quotes": ["Slow loading on 4G."], "action_ideas": ["Cache assets"]}))
+        raise ValueError("enrichment unavailable")
+
+    engine = ThemeClusteringEngine(api_key="test-key")
+    engine.client = MagicMock()
+    engine.client.chat.completions.create.side_effect = respond
+    reviews = [dict(r, title="") for r in raw_reviews_sample]
+
+    assert engine._select_theme_reviews({"label": "Slow Loading", "summary": "Pages are slow on 4G."}, reviews) == [reviews[2]]
+
+    themes = engine.cluster_reviews(reviews)
+
+    assert engine.client.chat.completions.create.call_count == 3
+    assert [t.label for t in themes] == ["Intuitive Interface", "Slow Loading"]
+    # A failed enrichment keeps the theme, padded with placeholders
+    assert themes[0].high_signal_quotes == ["No relevant quote found"] * 3
+    assert themes[1].high_signal_quotes[0] == "Slow loading on 4G."
+    assert len(themes[1].action_ideas) == 3
+
+def test_pack_reviews_respects_token_budget(raw_reviews_sample):
+    engine = ThemeClusteringEngine(api_key="test-key")
+    reviews = [dict(r, title="") for r in raw_reviews_sample]
+    assert len(engine._pack_reviews(reviews)) == len(reviews)
+
+    # Shrink the budget so only the prompt overhead plus one review fits
+    overhead = engine._count_tokens(engine.SYSTEM_MESSAGE) + engine._count_tokens(engine.CLUSTERING_PROMPT)
+    first_line = f"- [{reviews[0]['rating']}*] : {reviews[0]['review_text']}"
+    engine.OUTPUT_TOKEN_RESERVE = 0
+    engine.max_input_tokens = overhead + engine._count_tokens(first_line) + 1
+    assert engine._pack_reviews(reviews) == [first_line]
+
+def test_input_budget_follows_model_context_window():
+    assert ThemeClusteringEngine(api_key="test-key").max_input_tokens == 115200
+    assert ThemeClusteringEngine(model="gpt-4o-mini-2024-07-18", api_key="test-key").max_input_tokens == 115200
+    assert ThemeClusteringEngine(model="gpt-4", api_key="test-key").max_input_tokens == 7372
+
+def test_load_encoding_attempted_once_per_model():
+    ThemeClusteringEngine._load_encoding.cache_clear()
+    with patch("src.theme_engine.tiktoken.encoding_for_model", side_effect=OSError("offline")) as mock_load:
+        ThemeClusteringEngine(api_key="test-key")
+        engine = ThemeClusteringEngine(api_key="test-key")
+    assert mock_load.call_count == 1
+    assert engine._enc is None
+    ThemeClusteringEngine._load_encoding.cache_clear()
@@ -5,10 +5,13 @@ from google_play_scraper import app as gplay_app
 
 db_path = r'd:\development\weekly-app-review-pulse\data\pulse.db'
 
+# One keep-alive session for every iTunes lookup in the loop below
+session = requests.Session()
+
 def get_app_store_icon(app_id):
     try:
         url = f"https://itunes.apple.com/lookup?id={app_id}"
-        resp = requests.get(url).json()
+        resp = session.get(url).json()
         if resp.get('resultCount', 0) > 0:
             return resp['results'][0].get('artworkUrl512', '')
     except:
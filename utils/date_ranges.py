@@ -0,0 +1,47 @@
+import functools
+import re
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+# custom_YYYYMMDD_YYYYMMDD_HHMMSS[_xxxxxx] (dashboard) or YYYY-WNN (weekly, strftime "%Y-W%W")
+_RUN_ID_RE = re.compile(r"custom_(\d{4})(\d{2})(\d{2})_(\d{4})(\d{2})(\d{2})|(\d{4})-W(\d{1,2})$")
+
+@functools.lru_cache(maxsize=1024)
+def format_run_date_range(run_id: str, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                          sep: str = " - ", empty: str = "-") -> str:
+    """
+    Human-readable date range for a pipeline run, e.g. "Jan 01 - Jan 07 2024".
+    Run ids are matched with one precompiled regex rather than strptime;
+    results are memoized per run for the life of the process.
+    """
+    try:
+        m = _RUN_ID_RE.match(run_id)
+        if m and m.group(1):
+            s = date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+            e = date(int(m.group(4)), int(m.group(5)), int(m.group(6)))
+            return f"{s.strftime('%b %d')}{sep}{e.strftime('%b %d %Y')}"
+        elif m:
+            # Week 1 starts on the year's first Monday
+            jan1 = date(int(m.group(7)), 1, 1)
+            week_start = jan1 + timedelta(days=(7 - jan1.weekday()) % 7 + (int(m.group(8)) - 1) * 7)
+            return f"{week_start.strftime('%b %d')}{sep}{(week_start + timedelta(days=6)).strftime('%b %d %Y')}"
+        elif start_date and end_date:
+            s = datetime.fromisoformat(start_date)
+            e = datetime.fromisoformat(end_date)
+            return f"{s.strftime('%b %d')}{sep}{e.strftime('%b %d %Y')}"
+    except Exception:
+        pass
+    return empty
+
+@functools.lru_cache(maxsize=1024)
+def format_timestamp_label(timestamp: Optional[str]) -> str:
+    """
+    Dashboard label for an ISO timestamp, e.g. "Jan 01, 2024 03:04 PM".
+    Falls back to the raw minute prefix when it can't be parsed.
+    """
+    if not timestamp:
+        return "-"
+    try:
+        return datetime.fromisoformat(timestamp).strftime("%b %d, %Y %I:%M %p")
+    except ValueError:
+        return timestamp[:16]
@@ -1,11 +1,59 @@
 import logging
 import sys
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+import atexit
+import gzip
+import shutil
+import threading
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+
+# One background listener per log file; it owns the only RotatingFileHandler
+# for that file, so callers just enqueue records instead of writing to disk.
+_file_listeners = {}
+_listeners_lock = threading.Lock()
+
+def _gzip_namer(name: str) -> str:
+    return name + ".gz"
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    """Compresses the full log into its numbered backup instead of renaming it."""
+    with open(source, 'rb') as f_in, gzip.open(dest, 'wb') as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+def _rotating_file_handler(path: str, formatter: logging.Formatter) -> RotatingFileHandler:
+    """Size-based rotation; backups are kept as <log>.N.gz."""
+    file_handler = RotatingFileHandler(
+        path, 
+        maxBytes=10*1024*1024, 
+        backupCount=5
+    )
+    file_handler.namer = _gzip_namer
+    file_handler.rotator = _gzip_rotator
+    file_handler.setFormatter(formatter)
+    return file_handler
+
+def _get_file_listener(log_file: str, formatter: logging.Formatter) -> QueueListener:
+    with _listeners_lock:
+        listener = _file_listeners.get(log_file)
+        if listener is None:
+            file_handler = _rotating_file_handler(os.path.join('logs', log_file), formatter)
+            listener = QueueListener(queue.SimpleQueue(), file_handler, respect_handler_level=True)
+            listener.start()
+            _file_listeners[log_file] = listener
+        return listener
+
+@atexit.register
+def _stop_listeners():
+    """Drains queued records into their files on interpreter shutdown."""
+    with _listeners_lock:
+        while _file_listeners:
+            _file_listeners.popitem()[1].stop()
 
 def setup_logger(name: str, log_file: str = "pulse_pipeline.log", level=None):
     """
-    Sets up a logger with both console and rotating file handlers.
+    Sets up a logger with a console handler and a queued rotating file handler.
     """
     if level is None:
         level_str = os.getenv("LOG_LEVEL", "INFO").upper()
@@ -15,25 +63,18 @@ def setup_logger(name: str, log_file: str = "pulse_pipeline.log", level=None):
         '%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s'
     )
 
-    # Console Handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(formatter)
-
-    # File Handler (Rotating)
-    file_handler = RotatingFileHandler(
-        os.path.join('logs', log_file), 
-        maxBytes=10*1024*1024, 
-        backupCount=5
-    )
-    file_handler.setFormatter(formatter)
-
     logger = logging.getLogger(name)
     logger.setLevel(level)
     
     # Avoid duplicate handlers if setup_logger is called multiple times
     if not logger.handlers:
+        # Console Handler
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(formatter)
         logger.addHandler(console_handler)
-        logger.addHandler(file_handler)
+
+        # File Handler (Rotating), fed through the listener's queue
+        logger.addHandler(QueueHandler(_get_file_listener(log_file, formatter).queue))
     
     return logger
 